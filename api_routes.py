@@ -5,7 +5,7 @@ import time
 import uuid
 import os
 
-def create_api_routes(app, downloader, download_manager):
+def create_api_routes(app, downloader, download_manager, story_cache=None, prefetcher=None):
     """Create all API routes"""
     
     @app.route('/api/health', methods=['GET'])
@@ -18,13 +18,27 @@ def create_api_routes(app, downloader, download_manager):
         try:
             data = request.get_json()
             input_value = data.get('input', '').strip()
+            probe_formats = bool(data.get('probe_formats', False))
             
             if not input_value:
                 return jsonify(success=False, message="Username or URL is required"), 400
             
+            # Watched profiles are kept warm by the prefetcher; probed results carry
+            # liveness, so they are always fetched fresh
+            if story_cache and prefetcher and prefetcher.is_watched(input_value) and not probe_formats:
+                cached = story_cache.get(input_value)
+                if cached:
+                    print(f"Serving cached stories for: {input_value}")
+                    return jsonify(success=True, data=cached, cached=True)
+            
             print(f"Extracting stories and spotlight for: {input_value}")
             
-            result = downloader.extract_user_stories(input_value)
+            result = downloader.extract_user_stories(input_value, probe_formats=probe_formats)
+            
+            # Only watched profiles are cached, and an empty listing never replaces content
+            has_content = result['total_count'] + result['spotlight_count'] > 0
+            if story_cache and prefetcher and not probe_formats and has_content:
+                prefetcher.cache_if_watched(input_value, result)
             
             return jsonify(success=True, data=result)
             
@@ -135,4 +149,48 @@ def create_api_routes(app, downloader, download_manager):
             
         except Exception as e:
             print(f"Error in batch_download: {e}")
-            return jsonify(success=False, message=str(e)), 500
\ No newline at end of file
+            return jsonify(success=False, message=str(e)), 500
+
+    @app.route('/api/snapchat/watchlist', methods=['GET'])
+    def get_watchlist():
+        """List watched usernames and their prefetch state"""
+        if not prefetcher:
+            return jsonify(success=False, message="Watchlist is not enabled"), 404
+        
+        return jsonify(success=True, watchlist=prefetcher.list_entries())
+
+    @app.route('/api/snapchat/watchlist', methods=['POST'])
+    def add_to_watchlist():
+        """Add usernames to the watchlist"""
+        if not prefetcher:
+            return jsonify(success=False, message="Watchlist is not enabled"), 404
+        
+        try:
+            data = request.get_json()
+            usernames = data.get('usernames', [])
+            
+            if not isinstance(usernames, list) or not all(isinstance(username, str) for username in usernames):
+                return jsonify(success=False, message="usernames must be a list of strings"), 400
+            
+            usernames = [username for username in usernames if username.strip()]
+            if not usernames:
+                return jsonify(success=False, message="No usernames provided"), 400
+            
+            added = [prefetcher.add(username) for username in usernames]
+            
+            return jsonify(success=True, added=added)
+            
+        except Exception as e:
+            print(f"Error in add_to_watchlist: {e}")
+            return jsonify(success=False, message=str(e)), 500
+
+    @app.route('/api/snapchat/watchlist/<username>', methods=['DELETE'])
+    def remove_from_watchlist(username):
+        """Remove a username from the watchlist"""
+        if not prefetcher:
+            return jsonify(success=False, message="Watchlist is not enabled"), 404
+        
+        if not prefetcher.remove(username):
+            return jsonify(success=False, message="Username not in watchlist"), 404
+        
+        return jsonify(success=True)
@@ -3,6 +3,8 @@ from flask_cors import CORS
 from snapchat_downloader import SnapchatDownloader
 from download_manager import DownloadManager
 from api_routes import create_api_routes
+from story_cache import StoryCache
+from watchlist_prefetcher import WatchlistPrefetcher
 import os
 
 # Initialize Flask app
@@ -12,9 +14,27 @@ CORS(app)
 # Initialize components
 downloader = SnapchatDownloader()
 download_manager = DownloadManager(downloader)
+story_cache = StoryCache(default_ttl=int(os.environ.get("STORY_CACHE_TTL", 300)))
+prefetcher = WatchlistPrefetcher(
+    downloader,
+    story_cache,
+    interval=int(os.environ.get("WATCHLIST_INTERVAL", 600)),
+    jitter=int(os.environ.get("WATCHLIST_JITTER", 60)),
+    max_concurrency=int(os.environ.get("WATCHLIST_CONCURRENCY", 4))
+)
+
+# Seed watchlist from comma-separated WATCHLIST env var
+for username in os.environ.get("WATCHLIST", "").split(","):
+    if username.strip():
+        prefetcher.add(username)
+
+# With the debug reloader both the watcher parent and the serving child import
+# this module; only start the scheduler in the process that serves requests
+if __name__ != "__main__" or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+    prefetcher.start()
 
 # Create API routes
-create_api_routes(app, downloader, download_manager)
+create_api_routes(app, downloader, download_manager, story_cache, prefetcher)
 
 
 
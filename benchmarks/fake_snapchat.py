@@ -0,0 +1,169 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import threading
+import time
+
+class FakeSnapchatServer:
+    """Local stand-in for Snapchat profile pages and sc-cdn media"""
+
+    def __init__(self, host='127.0.0.1', port=0, default_profile_size=10, media_size=256 * 1024,
+                 hls_segments=4, chunk_size=64 * 1024, chunk_delay=0, url_lifetime=3600):
+        self.default_profile_size = default_profile_size
+        self.profile_sizes = {}
+        self.media_size = media_size
+        self.hls_segments = hls_segments
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.url_lifetime = url_lifetime
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.handle(self, send_body=True)
+
+            def do_HEAD(self):
+                server.handle(self, send_body=False)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='fake-snapchat')
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def set_profile_size(self, username, size):
+        self.profile_sizes[username.lower()] = size
+
+    def build_entry(self, username, index):
+        """Build one fake story entry in the shape yt-dlp extractors return"""
+        entry_id = f"{username}_{index:05d}"
+        media = f"{self.base_url}/snap-cdn/{entry_id}"
+        # Signed like sc-cdn links so expiry tracking has something to parse
+        signature = f"Expires={int(time.time()) + self.url_lifetime}"
+        return {
+            'id': entry_id,
+            'title': f"{username} story {index}",
+            'thumbnail': f"{media}.jpg",
+            # Alternate short stories and longer spotlight-style clips
+            'duration': 30 if index % 2 else 10,
+            'view_count': index * 50,
+            'upload_date': '20240101',
+            'webpage_url': f"https://www.snapchat.com/t/{entry_id}",
+            'formats': [
+                {
+                    'format_id': 'mp4-720',
+                    'url': f"{media}.mp4?{signature}",
+                    'ext': 'mp4',
+                    'width': 720,
+                    'height': 1280,
+                    'vcodec': 'avc1',
+                    'acodec': 'mp4a',
+                    'protocol': 'https',
+                },
+                {
+                    'format_id': 'hls-480',
+                    'url': f"{media}.m3u8?{signature}",
+                    'ext': 'mp4',
+                    'width': 270,
+                    'height': 480,
+                    'vcodec': 'avc1',
+                    'acodec': 'mp4a',
+                    'protocol': 'm3u8_native',
+                },
+            ],
+        }
+
+    def render_page(self, data):
+        # Pad like a real profile page so page size scales with entries
+        payload = json.dumps(data)
+        padding = '<div class="filler"></div>' * (len(data['entries']) * 20)
+        return (f'<html><head><title>{data["username"]} | Snapchat</title></head><body>{padding}'
+                f'<script id="__NEXT_DATA__" type="application/json">{payload}</script></body></html>')
+
+    def handle(self, handler, send_body):
+        with self.lock:
+            self.request_count += 1
+
+        path = handler.path.split('?')[0]
+
+        if path.startswith('/snap-cdn/'):
+            return self.handle_media(handler, path[len('/snap-cdn/'):], send_body)
+
+        story_match = re.match(r'^/t/(?P<username>.+)_(?P<index>\d+)$', path)
+        if story_match:
+            entry = self.build_entry(story_match.group('username'), int(story_match.group('index')))
+            data = {'username': story_match.group('username'), 'single': True, 'entries': [entry]}
+            return self.send(handler, 200, 'text/html', self.render_page(data).encode(), send_body)
+
+        user_match = re.search(r'(?:@|/add/|/discover/)(?P<username>[A-Za-z0-9_.-]+)', path)
+        if not user_match:
+            return self.send(handler, 404, 'text/plain', b'not found', send_body)
+
+        username = user_match.group('username').lower()
+        size = self.profile_sizes.get(username, self.default_profile_size)
+        data = {'username': username, 'entries': [self.build_entry(username, i) for i in range(size)]}
+        return self.send(handler, 200, 'text/html', self.render_page(data).encode(), send_body)
+
+    def handle_media(self, handler, name, send_body):
+        if name.endswith('.mp4'):
+            return self.send_stream(handler, 'video/mp4', self.media_size, send_body)
+        if name.endswith('.ts'):
+            return self.send_stream(handler, 'video/mp2t', self.media_size // max(self.hls_segments, 1), send_body)
+        if name.endswith('.m3u8'):
+            stem = name[:-len('.m3u8')]
+            lines = ['#EXTM3U', '#EXT-X-VERSION:3', '#EXT-X-TARGETDURATION:3', '#EXT-X-MEDIA-SEQUENCE:0']
+            for segment in range(self.hls_segments):
+                lines += ['#EXTINF:2.5,', f"{self.base_url}/snap-cdn/{stem}_{segment}.ts"]
+            lines.append('#EXT-X-ENDLIST')
+            return self.send(handler, 200, 'application/vnd.apple.mpegurl', '\n'.join(lines).encode(), send_body)
+        if name.endswith('.jpg'):
+            return self.send(handler, 200, 'image/jpeg', b'\xff\xd8\xff\xd9', send_body)
+        return self.send(handler, 404, 'text/plain', b'not found', send_body)
+
+    def send(self, handler, status, content_type, body, send_body):
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        if send_body:
+            handler.wfile.write(body)
+
+    def send_stream(self, handler, content_type, size, send_body):
+        handler.send_response(200)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(size))
+        handler.send_header('Accept-Ranges', 'none')
+        handler.end_headers()
+        if not send_body:
+            return
+        chunk = b'\x00' * self.chunk_size
+        remaining = size
+        try:
+            while remaining > 0:
+                handler.wfile.write(chunk[:min(remaining, self.chunk_size)])
+                remaining -= self.chunk_size
+                if self.chunk_delay:
+                    time.sleep(self.chunk_delay)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
@@ -0,0 +1,134 @@
+import contextlib
+import math
+import resource
+import threading
+import time
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def rss_mb():
+    """Current resident set size in MB"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak RSS is the best we can do without /proc (kB on Linux)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class ResourceSampler:
+    """Sample RSS and thread count in the background to capture peaks"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_rss = 0.0
+        self.peak_threads = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def sample(self):
+        self.peak_rss = max(self.peak_rss, rss_mb())
+        self.peak_threads = max(self.peak_threads, threading.active_count())
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.sample()
+            self.stop_event.wait(self.interval)
+
+    def __enter__(self):
+        self.start_rss = rss_mb()
+        self.start_threads = threading.active_count()
+        self.sample()
+        self.thread = threading.Thread(target=self.run, name='resource-sampler')
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
+        self.sample()
+        self.end_rss = rss_mb()
+        self.end_threads = threading.active_count()
+
+class LatencyRecorder:
+    """Thread-safe collection of latency samples per label, measured in phases"""
+
+    def __init__(self):
+        self.samples = {}
+        self.windows = {}
+        self.current_labels = None
+        self.lock = threading.Lock()
+
+    def record(self, label, seconds):
+        with self.lock:
+            self.samples.setdefault(label, []).append(seconds)
+            if self.current_labels is not None:
+                self.current_labels.add(label)
+
+    def time(self, label, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.record(label, time.perf_counter() - start)
+
+    @contextlib.contextmanager
+    def phase(self):
+        """Measure wall time, RSS and threads for the labels recorded inside this block"""
+        with self.lock:
+            self.current_labels = set()
+        with ResourceSampler() as sampler:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                wall_time = time.perf_counter() - start
+        with self.lock:
+            labels, self.current_labels = self.current_labels, None
+            for label in labels:
+                self.windows.setdefault(label, []).append((wall_time, sampler))
+
+    def rows(self, scenario):
+        """Summarize samples into report rows, each over its own phase windows"""
+        rows = []
+        for label, samples in self.samples.items():
+            windows = self.windows.get(label, [])
+            wall_time = sum(window[0] for window in windows)
+            samplers = [window[1] for window in windows]
+            rows.append({
+                'scenario': scenario,
+                'target': label,
+                'count': len(samples),
+                'p50_ms': percentile(samples, 50) * 1000,
+                'p99_ms': percentile(samples, 99) * 1000,
+                'throughput_per_s': len(samples) / wall_time if wall_time else 0.0,
+                'rss_start_mb': samplers[0].start_rss if samplers else 0.0,
+                'rss_peak_mb': max((sampler.peak_rss for sampler in samplers), default=0.0),
+                'threads_start': samplers[0].start_threads if samplers else 0,
+                'threads_peak': max((sampler.peak_threads for sampler in samplers), default=0),
+                'threads_end': samplers[-1].end_threads if samplers else 0,
+            })
+        return rows
+
+def format_table(rows):
+    """Render report rows as a fixed-width table"""
+    header = (f"{'scenario':<16} {'target':<48} {'n':>5} {'p50 ms':>9} {'p99 ms':>9} "
+              f"{'ops/s':>8} {'rss MB':>14} {'threads':>12}")
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['scenario']:<16} {row['target']:<48} {row['count']:>5} "
+            f"{row['p50_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['throughput_per_s']:>8.2f} "
+            f"{row['rss_start_mb']:>6.1f}->{row['rss_peak_mb']:<6.1f} "
+            f"{row['threads_start']:>3}->{row['threads_peak']:<3}/{row['threads_end']:<3}"
+        )
+    return '\n'.join(lines)
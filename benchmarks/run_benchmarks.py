@@ -0,0 +1,86 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from fake_snapchat import FakeSnapchatServer
+import stub_extractor
+import scenarios
+from metrics import format_table
+from snapchat_downloader import SnapchatDownloader
+from download_manager import DownloadManager
+from api_routes import create_api_routes
+from story_cache import StoryCache
+from watchlist_prefetcher import WatchlistPrefetcher
+
+SCENARIOS = ['single_lookup', 'batch_download', 'status_polling', 'large_profile', 'api_routes']
+
+class BenchContext:
+    def __init__(self, server):
+        self.server = server
+        self.downloader = SnapchatDownloader()
+        self.download_manager = DownloadManager(self.downloader)
+        self.story_cache = StoryCache()
+        # Scheduler is left stopped so background prefetches do not skew measurements
+        self.prefetcher = WatchlistPrefetcher(self.downloader, self.story_cache)
+        self.app = Flask(__name__)
+        create_api_routes(self.app, self.downloader, self.download_manager, self.story_cache, self.prefetcher)
+        self.client = self.app.test_client()
+
+def run(args):
+    server = FakeSnapchatServer(default_profile_size=args.profile_size, media_size=args.media_size).start()
+    stub_extractor.install(server.base_url)
+    ctx = BenchContext(server)
+
+    runners = {
+        'single_lookup': lambda: scenarios.single_lookup(ctx, args.iterations),
+        'batch_download': lambda: scenarios.batch_download(ctx, args.batch_size),
+        'status_polling': lambda: scenarios.status_polling(ctx, args.batch_size, args.pollers, args.poll_duration),
+        'large_profile': lambda: scenarios.large_profile(ctx, args.large_profile_size, max(1, args.iterations // 5)),
+        'api_routes': lambda: scenarios.api_routes(ctx, args.iterations * 10),
+    }
+
+    rows = []
+    try:
+        for name in args.scenarios:
+            print(f"Running scenario: {name}", file=sys.stderr)
+            # The app logs every step with print(); keep it out of the report unless asked
+            output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+            with output:
+                rows += runners[name]()
+    finally:
+        stub_extractor.uninstall()
+        server.stop()
+
+    print(format_table(rows))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks against a local Snapchat stand-in")
+    parser.add_argument('scenarios', nargs='*', default=SCENARIOS,
+                        help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--iterations', type=int, default=20, help="Iterations per lookup target")
+    parser.add_argument('--profile-size', type=int, default=10, help="Entries per ordinary profile")
+    parser.add_argument('--large-profile-size', type=int, default=300, help="Entries in the large profile")
+    parser.add_argument('--media-size', type=int, default=256 * 1024, help="Bytes per fake media file")
+    parser.add_argument('--batch-size', type=int, default=8, help="Downloads per batch")
+    parser.add_argument('--pollers', type=int, default=16, help="Concurrent status pollers")
+    parser.add_argument('--poll-duration', type=float, default=3.0, help="Seconds of status polling")
+    parser.add_argument('--json', help="Also write results to this JSON file")
+    parser.add_argument('--verbose', action='store_true', help="Show application output")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    run(args)
+
+if __name__ == '__main__':
+    main()
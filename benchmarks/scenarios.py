@@ -0,0 +1,176 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from metrics import LatencyRecorder
+
+def wait_for_download(download_manager, download_id, timeout=60):
+    """Block until a download reaches a terminal state"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = download_manager.get_download_status(download_id)
+        if status and status['status'] in ('completed', 'failed'):
+            return status
+        time.sleep(0.01)
+    raise TimeoutError(f"Download {download_id} did not finish within {timeout}s")
+
+def media_urls(username, count):
+    """Story page URLs the stub extractor resolves to single entries"""
+    return [f"https://www.snapchat.com/t/{username}_{i:05d}" for i in range(count)]
+
+def run_scenario(name, body):
+    """Run a scenario body and summarize its latencies per target phase"""
+    recorder = LatencyRecorder()
+    body(recorder)
+    return recorder.rows(name)
+
+def single_lookup(ctx, iterations):
+    """One profile lookup at a time: extractor, uncached route, cached route, probed route"""
+    def body(recorder):
+        with recorder.phase():
+            for _ in range(iterations):
+                recorder.time('extract_user_stories', ctx.downloader.extract_user_stories, 'bench_user')
+
+        with recorder.phase():
+            for _ in range(iterations):
+                recorder.time('POST /api/snapchat/stories (uncached)', ctx.client.post,
+                              '/api/snapchat/stories', json={'input': 'bench_user'})
+
+        # Only watched profiles are served from the cache
+        ctx.prefetcher.add('bench_user')
+        ctx.client.post('/api/snapchat/stories', json={'input': 'bench_user'})
+        with recorder.phase():
+            for _ in range(iterations):
+                recorder.time('POST /api/snapchat/stories (cached)', ctx.client.post,
+                              '/api/snapchat/stories', json={'input': 'bench_user'})
+        ctx.prefetcher.remove('bench_user')
+        ctx.story_cache.clear()
+
+        with recorder.phase():
+            for _ in range(iterations):
+                recorder.time('POST /api/snapchat/stories (probe_formats)', ctx.client.post,
+                              '/api/snapchat/stories', json={'input': 'bench_user', 'probe_formats': True})
+
+    return run_scenario('single_lookup', body)
+
+def batch_download(ctx, batch_size):
+    """Direct and route-driven downloads, mixing MP4 and HLS formats"""
+    urls = media_urls('bench_batch', batch_size)
+
+    def body(recorder):
+        with recorder.phase():
+            for i, url in enumerate(urls):
+                # Lower quality cap selects the HLS format
+                quality = '480p' if i % 2 else 'best'
+                download_id, _ = recorder.time('download_with_progress', ctx.download_manager.download_with_progress,
+                                               url, 'mp4', quality)
+                ctx.download_manager.cleanup_download(download_id)
+
+        download_ids = []
+        with recorder.phase():
+            for url in urls:
+                response = recorder.time('POST /api/snapchat/download', ctx.client.post,
+                                         '/api/snapchat/download', json={'url': url})
+                download_ids.append(response.get_json()['download_id'])
+        for download_id in download_ids:
+            wait_for_download(ctx.download_manager, download_id)
+
+        # The request and the downloads it starts are separate phases, so the route's
+        # throughput is not diluted by the time spent waiting for completion
+        with recorder.phase():
+            started = time.perf_counter()
+            response = recorder.time('POST /api/snapchat/batch-download', ctx.client.post,
+                                     '/api/snapchat/batch-download', json={'urls': urls})
+        batch_ids = response.get_json()['download_ids']
+
+        with recorder.phase():
+            for download_id in batch_ids:
+                wait_for_download(ctx.download_manager, download_id)
+                recorder.record('batch download completion', time.perf_counter() - started)
+        download_ids += batch_ids
+
+        with recorder.phase():
+            for download_id in download_ids:
+                response = recorder.time('GET /api/snapchat/download/file/<id>', ctx.client.get,
+                                         f'/api/snapchat/download/file/{download_id}')
+                response.get_data()
+                response.close()
+
+    return run_scenario('batch_download', body)
+
+def status_polling(ctx, downloads, pollers, duration):
+    """Many clients polling status while throttled downloads are in flight"""
+    urls = media_urls('bench_poll', downloads)
+
+    def body(recorder):
+        previous_delay = ctx.server.chunk_delay
+        ctx.server.chunk_delay = 0.02
+        try:
+            response = ctx.client.post('/api/snapchat/batch-download', json={'urls': urls})
+            download_ids = response.get_json()['download_ids']
+            stop_event = threading.Event()
+
+            def poll():
+                client = ctx.app.test_client()
+                i = 0
+                while not stop_event.is_set():
+                    recorder.time('GET /api/snapchat/download/status/<id>', client.get,
+                                  f'/api/snapchat/download/status/{download_ids[i % len(download_ids)]}')
+                    i += 1
+
+            with recorder.phase():
+                with ThreadPoolExecutor(max_workers=pollers) as executor:
+                    for _ in range(pollers):
+                        executor.submit(poll)
+                    time.sleep(duration)
+                    stop_event.set()
+
+            for download_id in download_ids:
+                wait_for_download(ctx.download_manager, download_id)
+                ctx.download_manager.cleanup_download(download_id)
+        finally:
+            ctx.server.chunk_delay = previous_delay
+
+    return run_scenario('status_polling', body)
+
+def large_profile(ctx, profile_size, iterations):
+    """Lookups against a profile with many entries"""
+    ctx.server.set_profile_size('bench_large', profile_size)
+
+    def body(recorder):
+        with recorder.phase():
+            for _ in range(iterations):
+                recorder.time(f'extract_user_stories ({profile_size} entries)',
+                              ctx.downloader.extract_user_stories, 'bench_large')
+
+        with recorder.phase():
+            for _ in range(iterations):
+                recorder.time(f'POST /api/snapchat/stories ({profile_size} entries)', ctx.client.post,
+                              '/api/snapchat/stories', json={'input': 'bench_large'})
+
+    return run_scenario('large_profile', body)
+
+def api_routes(ctx, iterations):
+    """Lightweight routes: health check and watchlist management"""
+    usernames = [f'bench_watch_{i}' for i in range(iterations)]
+
+    def body(recorder):
+        with recorder.phase():
+            for _ in usernames:
+                recorder.time('GET /api/health', ctx.client.get, '/api/health')
+
+        with recorder.phase():
+            for username in usernames:
+                recorder.time('POST /api/snapchat/watchlist', ctx.client.post,
+                              '/api/snapchat/watchlist', json={'usernames': [username]})
+
+        with recorder.phase():
+            for _ in usernames:
+                recorder.time('GET /api/snapchat/watchlist', ctx.client.get, '/api/snapchat/watchlist')
+
+        with recorder.phase():
+            for username in usernames:
+                recorder.time('DELETE /api/snapchat/watchlist/<username>', ctx.client.delete,
+                              f'/api/snapchat/watchlist/{username}')
+
+    return run_scenario('api_routes', body)
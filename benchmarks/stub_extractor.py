@@ -0,0 +1,38 @@
+import yt_dlp
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.extractor.generic import GenericIE
+
+RealYoutubeDL = yt_dlp.YoutubeDL
+
+class StubSnapchatIE(InfoExtractor):
+    """yt-dlp extractor that resolves snapchat.com URLs against the local stand-in server"""
+    IE_NAME = 'snapchat:bench'
+    _VALID_URL = r'https?://(?:www\.|story\.)?snapchat\.com/(?P<path>[^?#]+)'
+    base_url = None
+
+    def _real_extract(self, url):
+        path = self._match_valid_url(url).group('path')
+        webpage = self._download_webpage(f"{self.base_url}/{path}", path)
+        data = self._parse_json(self._search_regex(
+            r'<script id="__NEXT_DATA__" type="application/json">(.+?)</script>',
+            webpage, 'profile data'), path)
+
+        if data.get('single'):
+            return data['entries'][0]
+        return self.playlist_result(data['entries'], playlist_id=data['username'], playlist_title=data['username'])
+
+class BenchYoutubeDL(RealYoutubeDL):
+    """YoutubeDL that only knows the stub extractor plus direct media URLs, so nothing leaves the machine"""
+
+    def __init__(self, params=None, auto_init=True):
+        super().__init__(params, auto_init=False)
+        self.add_info_extractor(StubSnapchatIE())
+        self.add_info_extractor(GenericIE())
+
+def install(base_url):
+    """Route every yt_dlp.YoutubeDL built by the app through the stub extractor"""
+    StubSnapchatIE.base_url = base_url
+    yt_dlp.YoutubeDL = BenchYoutubeDL
+
+def uninstall():
+    yt_dlp.YoutubeDL = RealYoutubeDL
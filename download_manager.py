@@ -48,6 +48,9 @@ class DownloadManager:
         }
         
         try:
+            # Re-resolve signed CDN URLs that are about to expire
+            url = self.downloader.url_tracker.resolve(url)
+            
             # Use yt-dlp for all downloads
             temp_dir = tempfile.mkdtemp()
             
@@ -0,0 +1,114 @@
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait
+import threading
+import time
+
+class FormatProber:
+    def __init__(self, headers, max_workers=16, timeout=5, time_budget=8, cache_ttl=120):
+        self.headers = headers
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.time_budget = time_budget
+        self.cache_ttl = cache_ttl
+
+        # Pooled session so HEAD requests to the same CDN host reuse connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(headers)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='format-probe')
+        self.cache = {}
+        self.cache_lock = threading.Lock()
+
+    def get_cached(self, url):
+        """Return cached probe result for a URL if it has not expired"""
+        with self.cache_lock:
+            cached = self.cache.get(url)
+            if cached and cached['expires_at'] > time.time():
+                return cached['result']
+            if cached:
+                del self.cache[url]
+        return None
+
+    def store_cached(self, url, result):
+        """Cache probe result for a URL"""
+        with self.cache_lock:
+            self.cache[url] = {'result': result, 'expires_at': time.time() + self.cache_ttl}
+
+    def probe_url(self, url):
+        """Send a HEAD request and return filesize, content type and liveness"""
+        cached = self.get_cached(url)
+        if cached:
+            return cached
+
+        # is_live stays None when the probe could not tell live from dead
+        result = {'filesize': 0, 'content_type': None, 'is_live': None}
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in (405, 501):
+                # HEAD not supported by this host, fall back to a one-byte ranged GET
+                response = self.session.get(url, timeout=self.timeout, allow_redirects=True,
+                                            headers={'Range': 'bytes=0-0'}, stream=True)
+                response.close()
+        except Exception as e:
+            # Transient network errors are not cached so a live URL is not reported dead
+            print(f"HEAD probe failed for {url}: {e}")
+            return result
+
+        if response.status_code in (405, 429, 501) or response.status_code >= 500:
+            # Says nothing about whether the media itself has expired
+            print(f"HEAD probe inconclusive for {url}: HTTP {response.status_code}")
+            return result
+
+        result['is_live'] = response.status_code < 400
+        result['content_type'] = response.headers.get('Content-Type')
+        content_range = response.headers.get('Content-Range', '')
+        content_length = response.headers.get('Content-Length', '')
+        if response.status_code == 206 and content_range.rsplit('/', 1)[-1].isdigit():
+            result['filesize'] = int(content_range.rsplit('/', 1)[-1])
+        elif response.status_code != 206 and content_length.isdigit():
+            result['filesize'] = int(content_length)
+
+        self.store_cached(url, result)
+        return result
+
+    def enrich_entries(self, entries):
+        """Fill filesize, content type and liveness for every format of the given entries"""
+        formats = [fmt for entry in entries for fmt in entry.get('formats', []) if fmt.get('url')]
+        if not formats:
+            return entries
+
+        # Probe each distinct URL once; best_quality shares its dict with formats[0]
+        futures = {}
+        for fmt in formats:
+            if fmt['url'] not in futures:
+                futures[fmt['url']] = self.executor.submit(self.probe_url, fmt['url'])
+
+        done, not_done = wait(futures.values(), timeout=self.time_budget)
+        if not_done:
+            print(f"Format probing hit {self.time_budget}s budget, {len(not_done)} URLs left unprobed")
+            # Drop queued probes so they do not hold up other requests on the shared pool
+            for future in not_done:
+                future.cancel()
+
+        for fmt in formats:
+            future = futures[fmt['url']]
+            if future not in done:
+                fmt['content_type'] = None
+                fmt['is_live'] = None
+                continue
+            probe = future.result()
+            fmt['is_live'] = probe['is_live']
+            if fmt.get('protocol', 'http') not in ('http', 'https'):
+                # HEAD on an HLS/DASH manifest describes the playlist, not the media
+                fmt['content_type'] = None
+                continue
+            if probe['filesize']:
+                fmt['filesize'] = probe['filesize']
+            fmt['content_type'] = probe['content_type']
+
+        print(f"Probed {len(done)}/{len(futures)} format URLs")
+        return entries
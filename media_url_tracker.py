@@ -0,0 +1,178 @@
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import Future
+from datetime import datetime, timezone
+import base64
+import json
+import re
+import threading
+import time
+
+class MediaUrlTracker:
+    def __init__(self, snapchat_downloader, refresh_margin=120, assumed_lifetime=3600):
+        self.downloader = snapchat_downloader
+        # Refresh URLs that expire within this many seconds
+        self.refresh_margin = refresh_margin
+        # Lifetime assumed for signed URLs that carry no expiry metadata
+        self.assumed_lifetime = assumed_lifetime
+        self.records = {}
+        # Stale URL -> refreshed URL, kept until the refreshed URL itself expires
+        self.replacements = {}
+        self.in_flight = {}
+        self.lock = threading.Lock()
+
+    def parse_expiry(self, url):
+        """Parse expiry timestamp (epoch seconds) from a signed media URL, or None"""
+        try:
+            params = {k.lower(): v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        except Exception:
+            return None
+
+        # CloudFront canned policy / generic signed URLs
+        for key in ['expires', 'x-expires', 'exp']:
+            if params.get(key, '').isdigit():
+                return int(params[key])
+
+        # AWS SigV4 presigned URLs
+        if params.get('x-amz-date') and params.get('x-amz-expires', '').isdigit():
+            try:
+                signed_at = datetime.strptime(params['x-amz-date'], '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc)
+                return int(signed_at.timestamp()) + int(params['x-amz-expires'])
+            except ValueError:
+                pass
+
+        # CloudFront custom policy
+        if params.get('policy'):
+            try:
+                policy = params['policy'].replace('-', '+').replace('_', '=').replace('~', '/')
+                statement = json.loads(base64.b64decode(policy))['Statement'][0]
+                return int(statement['Condition']['DateLessThan']['AWS:EpochTime'])
+            except Exception:
+                pass
+
+        return None
+
+    def track_entries(self, entries):
+        """Record expiry and owning entry for every format URL and annotate formats with expires_at"""
+        now = time.time()
+        with self.lock:
+            # Drop records that expired long ago so the table does not grow forever
+            stale = [url for url, record in self.records.items() if record['expires_at'] < now - self.assumed_lifetime]
+            for url in stale:
+                del self.records[url]
+            expired = [old for old, new in self.replacements.items() if new not in self.records]
+            for old in expired:
+                del self.replacements[old]
+
+            for entry in entries:
+                for fmt in entry.get('formats', []):
+                    if not fmt.get('url'):
+                        continue
+                    expires_at = self.parse_expiry(fmt['url']) or int(now + self.assumed_lifetime)
+                    fmt['expires_at'] = expires_at
+                    self.records[fmt['url']] = {
+                        'entry_id': entry.get('id'),
+                        'snapchat_url': entry.get('snapchat_url'),
+                        'format_key': self.format_key(fmt),
+                        'expires_at': expires_at,
+                        # Same dict the listing (and any cached copy of it) holds
+                        'format': fmt
+                    }
+        return entries
+
+    def format_key(self, fmt):
+        """Identify a format across re-extractions"""
+        return (fmt.get('height', 0), fmt.get('width', 0), fmt.get('ext'), fmt.get('protocol'))
+
+    def is_entry_url(self, snapchat_url):
+        """Check whether a Snapchat URL points at a single story rather than a whole profile"""
+        if not snapchat_url:
+            return False
+        parsed = urlparse(snapchat_url)
+        if not parsed.netloc.endswith('snapchat.com'):
+            return False
+        return bool(re.match(r'^/(?:t/[^/]+|p/[^/]+/[^/]+|(?:@[^/]+/)?spotlight/[A-Za-z0-9_-]+)/?$', parsed.path))
+
+    def is_near_expiry(self, url):
+        """Check whether a tracked URL expires within the refresh margin"""
+        with self.lock:
+            record = self.records.get(url)
+        if not record:
+            return False
+        return record['expires_at'] - time.time() <= self.refresh_margin
+
+    def resolve(self, url):
+        """Return a live URL for a media URL, re-resolving its entry if it is near expiry"""
+        with self.lock:
+            replacement = self.replacements.get(url)
+        if replacement and not self.is_near_expiry(replacement):
+            return replacement
+
+        if not self.is_near_expiry(url):
+            return url
+
+        with self.lock:
+            record = self.records.get(url)
+        if not record:
+            return url
+
+        snapchat_url = record.get('snapchat_url')
+        if not self.is_entry_url(snapchat_url):
+            # Only a profile URL is known, refreshing would mean a full profile re-extraction
+            print(f"No entry URL to refresh near-expiry media URL: {url}")
+            return url
+
+        try:
+            refreshed = self.refresh_entry(snapchat_url, record['entry_id'])
+        except Exception as e:
+            print(f"Refresh failed for {snapchat_url}: {e}")
+            return url
+
+        if not refreshed:
+            print(f"Entry {record['entry_id']} not found when refreshing {snapchat_url}")
+            return url
+
+        new_fmt = next((fmt for fmt in refreshed.get('formats', []) if self.format_key(fmt) == record['format_key']), None)
+        if not new_fmt:
+            print(f"Format {record['format_key']} not found when refreshing {snapchat_url}")
+            return url
+
+        new_url = new_fmt['url']
+        if self.is_near_expiry(new_url):
+            # Still fresher than the stale URL, but not worth remembering
+            print(f"Refreshed URL for {snapchat_url} is itself near expiry")
+            return new_url
+
+        with self.lock:
+            self.replacements[url] = new_url
+            # Point the original listing at the refreshed URL as well
+            record['format']['url'] = new_url
+            record['format']['expires_at'] = new_fmt['expires_at']
+        return new_url
+
+    def refresh_entry(self, snapchat_url, entry_id):
+        """Re-extract a single entry, sharing one extraction among concurrent callers"""
+        with self.lock:
+            future = self.in_flight.get(snapchat_url)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.in_flight[snapchat_url] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            print(f"Refreshing near-expiry entry: {snapchat_url}")
+            extracted = self.downloader.extract_from_url(snapchat_url, 'snapchat_user')
+            entries = extracted['stories'] + extracted['spotlight']
+            self.track_entries(entries)
+            # Never fall back to another entry, that would hand out the wrong video
+            refreshed = next((e for e in entries if e['id'] == entry_id), None)
+            future.set_result(refreshed)
+            return refreshed
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(snapchat_url, None)
@@ -7,6 +7,8 @@ from datetime import datetime
 import time
 import uuid
 import re
+from format_prober import FormatProber
+from media_url_tracker import MediaUrlTracker
 
 class SnapchatDownloader:
     def __init__(self):
@@ -20,6 +22,8 @@ class SnapchatDownloader:
             'Upgrade-Insecure-Requests': '1',
             'Referer': 'https://www.snapchat.com/'
         }
+        self.format_prober = FormatProber(self.headers)
+        self.url_tracker = MediaUrlTracker(self)
     
     def is_snapchat_url(self, text):
         """Check if input is a Snapchat URL"""
@@ -96,7 +100,7 @@ class SnapchatDownloader:
         username = username.replace('@', '').strip()
         return f"https://www.snapchat.com/add/{username}"
     
-    def extract_user_stories(self, username_or_url):
+    def extract_user_stories(self, username_or_url, probe_formats=False):
         """Extract all stories and spotlight videos from a Snapchat user - REAL CONTENT ONLY"""
         try:
             if self.is_snapchat_url(username_or_url):
@@ -191,6 +195,13 @@ class SnapchatDownloader:
             
             print(f"Total valid extraction result: {len(all_stories)} stories, {len(all_spotlight)} spotlight")
             
+            # Track signed CDN URL expiry so downloads can refresh them lazily
+            self.url_tracker.track_entries(all_stories + all_spotlight)
+            
+            # Optionally fill in filesize, content type and liveness with HEAD requests
+            if probe_formats:
+                self.format_prober.enrich_entries(all_stories + all_spotlight)
+            
             return {
                 'username': username,
                 'profile_url': username_or_url if self.is_snapchat_url(username_or_url) else f"https://www.snapchat.com/add/{username}",
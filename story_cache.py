@@ -0,0 +1,61 @@
+from urllib.parse import urlparse
+import re
+import threading
+import time
+
+class StoryCache:
+    def __init__(self, default_ttl=300):
+        self.default_ttl = default_ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def make_key(self, username_or_url):
+        """Normalize a username or URL into a cache key"""
+        value = username_or_url.strip()
+        if '://' in value:
+            # Profile URLs share the username key; story/spotlight URLs stay distinct
+            parsed = urlparse(value)
+            profile_match = re.match(r'^/(?:add/|@)([^/]+)/?$', parsed.path)
+            if parsed.netloc.endswith('snapchat.com') and profile_match:
+                return profile_match.group(1).lower()
+            return value
+        return value.replace('@', '').lower()
+
+    def get(self, username_or_url):
+        """Return cached stories result if present and not expired"""
+        key = self.make_key(username_or_url)
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached and cached['expires_at'] > time.time():
+                return cached['result']
+            if cached:
+                del self.entries[key]
+        return None
+
+    def set(self, username_or_url, result, ttl=None):
+        """Store a stories result"""
+        key = self.make_key(username_or_url)
+        with self.lock:
+            self.entries[key] = {
+                'result': result,
+                'expires_at': time.time() + (ttl or self.default_ttl),
+                'cached_at': time.time()
+            }
+
+    def delete(self, username_or_url):
+        """Drop a cached result"""
+        key = self.make_key(username_or_url)
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def get_cached_at(self, username_or_url):
+        """Return the time a result was cached, or None"""
+        key = self.make_key(username_or_url)
+        with self.lock:
+            cached = self.entries.get(key)
+            return cached['cached_at'] if cached else None
+
+    def clear(self):
+        """Drop all cached results"""
+        with self.lock:
+            self.entries.clear()
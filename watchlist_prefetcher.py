@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+import time
+
+class WatchlistPrefetcher:
+    def __init__(self, snapchat_downloader, story_cache, interval=600, jitter=60, max_concurrency=4, tick=1):
+        self.downloader = snapchat_downloader
+        self.cache = story_cache
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.tick = tick
+
+        self.watchlist = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='watchlist-prefetch')
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def add(self, username):
+        """Add a username to the watchlist, scheduling its first prefetch within one interval"""
+        key = self.cache.make_key(username)
+        with self.lock:
+            if key not in self.watchlist:
+                self.watchlist[key] = {
+                    'username': key,
+                    # Spread first runs over a whole interval so a large watchlist does not fire at once
+                    'next_run': time.time() + max(random.uniform(0, self.interval) + random.uniform(-self.jitter, self.jitter), 0),
+                    'last_run': None,
+                    'last_error': None,
+                    'in_flight': False
+                }
+        return key
+
+    def remove(self, username):
+        """Remove a username from the watchlist and evict its cached listing"""
+        key = self.cache.make_key(username)
+        with self.lock:
+            removed = self.watchlist.pop(key, None) is not None
+            self.cache.delete(key)
+        return removed
+
+    def is_watched(self, username_or_url):
+        """Check whether a username is on the watchlist"""
+        with self.lock:
+            return self.cache.make_key(username_or_url) in self.watchlist
+
+    def cache_if_watched(self, username_or_url, result, ttl=None):
+        """Write a result into the lookup cache unless the profile is no longer watched"""
+        key = self.cache.make_key(username_or_url)
+        with self.lock:
+            # Checked under the lock so a concurrent remove() cannot be undone by a late write
+            if key not in self.watchlist:
+                return False
+            self.cache.set(key, result, ttl=ttl)
+        return True
+
+    def list_entries(self):
+        """Return a snapshot of the watchlist"""
+        with self.lock:
+            return [dict(entry) for entry in self.watchlist.values()]
+
+    def start(self):
+        """Start the background scheduler thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='watchlist-scheduler')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop the background scheduler thread"""
+        self.stop_event.set()
+
+    def run(self):
+        """Scheduler loop - submit due usernames without exceeding the concurrency limit"""
+        while not self.stop_event.is_set():
+            now = time.time()
+            with self.lock:
+                in_flight = sum(1 for entry in self.watchlist.values() if entry['in_flight'])
+                due = sorted(
+                    (entry for entry in self.watchlist.values()
+                     if not entry['in_flight'] and entry['next_run'] <= now),
+                    key=lambda entry: entry['next_run']
+                )[:max(self.max_concurrency - in_flight, 0)]
+                for entry in due:
+                    entry['in_flight'] = True
+
+            for entry in due:
+                self.executor.submit(self.prefetch, entry['username'])
+
+            self.stop_event.wait(self.tick)
+
+    def prefetch(self, username):
+        """Re-run extraction for a watched username and write it into the lookup cache"""
+        error = None
+        try:
+            print(f"Prefetching watched profile: {username}")
+            result = self.downloader.extract_user_stories(username)
+            if result['total_count'] + result['spotlight_count'] == 0:
+                # Extraction failures surface as an empty listing; never cache one,
+                # so reads keep any previous result or fall through to a live lookup
+                error = "Extraction returned no content, cache not updated"
+                print(f"Prefetch for {username}: {error}")
+            else:
+                # Keep the entry alive well past the next scheduled refresh
+                self.cache_if_watched(username, result, ttl=self.interval * 3)
+        except Exception as e:
+            print(f"Prefetch failed for {username}: {e}")
+            error = str(e)
+
+        with self.lock:
+            entry = self.watchlist.get(username)
+            if entry:
+                entry['in_flight'] = False
+                entry['last_run'] = time.time()
+                entry['last_error'] = error
+                entry['next_run'] = time.time() + self.interval + random.uniform(-self.jitter, self.jitter)